@@ -24,41 +24,265 @@ Vermont, and Maine.
 """
 
 #imports for graphical Analysis Streamlit Access, etc
+import os
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import streamlit as st
 import pydeck as pdk
 import matplotlib.pyplot as plt
+from numba import njit
 
 
 #Loading / Cleaning our Data [DA7]
+#Cached so reruns reuse the cleaned DataFrame instead of re-reading the CSV
+@st.cache_data(show_spinner=False)
 def load_and_prepare_data(file_path):
-    #Read the CSV new_england_airports file
-    df = pd.read_csv(file_path)
+    #Warm-start path: a Parquet cache written after the first clean keeps
+    #the dtypes and categoricals, so cold starts (deploys, container
+    #restarts) skip CSV parsing and cleaning entirely
+    parquet_path = os.path.splitext(file_path)[0] + '.parquet'
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(file_path):
+        return pd.read_parquet(parquet_path)
+
+    #Only parse the columns we actually keep (skips continent, iata_code,
+    #home_link, keywords, gps_code entirely instead of dropping them later)
+    keep_cols = ['id', 'ident', 'type', 'name', 'latitude_deg', 'longitude_deg',
+                 'elevation_ft', 'iso_country', 'iso_region', 'municipality',
+                 'scheduled_service', 'local_code', 'wikipedia_link']
+
+    #Read the CSV new_england_airports file with pyarrow's multithreaded
+    #reader and a declared schema: no per-column type inference, and the
+    #dictionary-encoded columns land in pandas as Categoricals for free
+    column_types = {
+        'id': pa.int32(),
+        'latitude_deg': pa.float32(),
+        'longitude_deg': pa.float32(),
+        'elevation_ft': pa.float32(),
+        #the CSV reader only supports int32 dictionary indices
+        'iso_region': pa.dictionary(pa.int32(), pa.string()),
+        'type': pa.dictionary(pa.int32(), pa.string()),
+    }
+    table = pacsv.read_csv(
+        file_path,
+        read_options=pacsv.ReadOptions(use_threads=True),
+        #strings_can_be_null makes blank fields NaN like pd.read_csv did,
+        #so the municipality dropna below still removes them
+        convert_options=pacsv.ConvertOptions(include_columns=keep_cols,
+                                             column_types=column_types,
+                                             strings_can_be_null=True)
+    )
+    df = table.to_pandas()
 
     #Filter for our New England states
     new_england_states = ['US-MA', 'US-CT', 'US-RI', 'US-NH', 'US-VT', 'US-ME']
     df = df[df['iso_region'].isin(new_england_states)]
-
-    #Drop Columns
-    columns_to_drop = ['continent', 'iata_code', 'home_link', 'keywords', 'gps_code']
-    df = df.drop(columns=columns_to_drop, axis=1)
+    #The CSV dictionary covers every US region; keep only the six states
+    #so widget options and the pivot don't list empty categories
+    df['iso_region'] = df['iso_region'].cat.remove_unused_categories()
 
     df['elevation_ft'] = df['elevation_ft'].fillna(df['elevation_ft'].median())
     df = df.dropna(subset=['municipality'])
+    #Airports without coordinates can never be mapped; dropping them here
+    #saves the per-rerun dropna scan the map section used to do
+    df = df.dropna(subset=['latitude_deg', 'longitude_deg'])
+
+    #Bin elevations in one vectorized pass instead of a per-row lambda
+    df['elevation_category'] = pd.cut(df['elevation_ft'],
+                                      bins=[-np.inf, 200, 1000, np.inf],
+                                      labels=['Low', 'Medium', 'High'],
+                                      right=False) #[DA1]
 
-    df['elevation_category'] = df['elevation_ft'].apply(
-        lambda x: 'Low' if x < 200 else 'Medium' if x < 1000 else 'High') #[DA1]
+    #The schema already delivers narrow coordinates and categorical
+    #strings; elevation just needs int32 once the median fill is done
+    df['elevation_ft'] = df['elevation_ft'].astype('int32')
+
+    df.to_parquet(parquet_path, compression='zstd')
     return df
 
-file_path = "new_england_airports(in).csv"
-data = load_and_prepare_data(file_path)
+#One-time dataset metadata (widget options and slider bounds), cached so
+#reruns don't redo the O(N) unique()/min()/max() passes over the dataset
+@st.cache_data(show_spinner=False)
+def get_dataset_meta(df):
+    meta = {
+        'elev_min': int(df['elevation_ft'].min()),
+        'elev_max': int(df['elevation_ft'].max()),
+        'states': df['iso_region'].cat.categories.tolist(),
+        'types': df['type'].cat.categories.tolist(),
+        'elev_categories': df['elevation_category'].cat.categories.tolist(),
+    }
+    if 'runway_length_ft' in df.columns:
+        meta['runway_min'] = int(df['runway_length_ft'].min())
+        meta['runway_max'] = int(df['runway_length_ft'].max())
+    return meta
+
+#isin for a category column done on its integer codes: the selection is
+#translated to codes once, then one vectorized np.isin over the code
+#array replaces per-row string hashing
+def category_isin(s, selected):
+    cats = s.cat.categories
+    sel_codes = np.array([cats.get_loc(v) for v in selected if v in cats], dtype='int32')
+    return np.isin(s.cat.codes.to_numpy(), sel_codes)
+
+#Pre-sorted elevation index, built once per dataset: the slider filter
+#then costs two binary searches plus a scatter instead of a full
+#between() scan over the column
+@st.cache_data(show_spinner=False)
+def get_elevation_index(df):
+    elev = df['elevation_ft'].to_numpy()
+    order = np.argsort(elev, kind='stable')
+    return elev[order], order
+
+#Cached filter step, keyed on the sidebar selections, so widgets that
+#don't change the filters (like the pie checkboxes) reuse the same slice
+@st.cache_data(show_spinner=False)
+def filter_airports(df, selected_state, selected_type, selected_elevation,
+                    elevation_range, runway_range):
+    #Only build masks for filters that actually exclude something; the
+    #default "everything selected" sidebar state then scans nothing
+    masks = []
+    if set(selected_state) != set(df['iso_region'].cat.categories):
+        masks.append(category_isin(df['iso_region'], selected_state)) #[DA5]
+    if set(selected_type) != set(df['type'].cat.categories):
+        masks.append(category_isin(df['type'], selected_type))
+    if set(selected_elevation) != set(df['elevation_category'].cat.categories):
+        masks.append(category_isin(df['elevation_category'], selected_elevation))
+    elev_sorted, elev_order = get_elevation_index(df)
+    if elevation_range[0] > elev_sorted[0] or elevation_range[1] < elev_sorted[-1]:
+        #O(log N) range lookup on the sorted index, then mark survivors
+        lo = np.searchsorted(elev_sorted, elevation_range[0], side='left')
+        hi = np.searchsorted(elev_sorted, elevation_range[1], side='right')
+        in_range = np.zeros(len(df), dtype=bool)
+        in_range[elev_order[lo:hi]] = True
+        masks.append(in_range) #[DA4]
+
+    #Fused into one reduce, then a single take() of the surviving row
+    #positions; every downstream consumer shares this one slice
+    if masks:
+        filtered = df.take(np.flatnonzero(np.logical_and.reduce(masks)))
+    else:
+        filtered = df
+    if runway_range is not None:
+        filtered = filtered[filtered['runway_length_ft'].between(*runway_range)]
+    return filtered
+
+#value_counts for a category column via one bincount over its int codes
+#(no string hashing; -1 codes are missing values and get skipped)
+def category_counts(s):
+    codes = s.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(s.cat.categories))
+    return pd.Series(counts, index=s.cat.categories).sort_values(ascending=False)
+
+#One fused compiled pass that builds the region-by-type pivot counts and
+#the elevation histogram together, so a large filtered slice is walked
+#once instead of once per pandas aggregation (kept serial: the counters
+#are shared, so a prange version would race on the increments)
+@njit(cache=True)
+def _aggregate_filtered(region_codes, type_codes, elev_ft, n_regions, n_types, bin_edges):
+    pivot = np.zeros((n_regions, n_types), np.int32)
+    hist = np.zeros(len(bin_edges) - 1, np.int32)
+    for i in range(len(elev_ft)):
+        pivot[region_codes[i], type_codes[i]] += 1
+        b = np.searchsorted(bin_edges, elev_ft[i], side='right') - 1
+        if b >= len(hist): #top edge is closed, like np.histogram
+            b = len(hist) - 1
+        hist[b] += 1
+    return pivot, hist
+
+#Cached O(N) summaries shared by the bar chart, the histogram and the
+#pivot table view
+@st.cache_data(show_spinner=False)
+def summarize_airports(df):
+    regions = df['iso_region'].cat.categories
+    types = df['type'].cat.categories
+    elev = df['elevation_ft'].to_numpy(dtype=np.float64)
+    bin_edges = np.histogram_bin_edges(elev, bins=20)
+    pivot, hist = _aggregate_filtered(df['iso_region'].cat.codes.to_numpy(),
+                                      df['type'].cat.codes.to_numpy(),
+                                      elev, len(regions), len(types), bin_edges)
+    type_counts = pd.Series(pivot.sum(axis=0), index=types).sort_values(ascending=False)
+    pivot_table = pd.DataFrame(pivot, index=regions.rename('iso_region'),
+                               columns=types.rename('type'))
+    return type_counts, pivot_table, hist, bin_edges
+
+#Cached figure/deck builders: when the inputs are unchanged st.pyplot /
+#st.pydeck_chart get the same object back and all the construction cost
+#(matplotlib figure setup, pydeck JSON serialization) is skipped
+@st.cache_resource(show_spinner=False)
+def make_pie_figure(counts):
+    fig, ax = plt.subplots()
+    counts.plot.pie(autopct='%1.1f%%', startangle=140, ax=ax)
+    ax.set_ylabel('')
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def make_histogram_figure(counts, edges):
+    fig, ax = plt.subplots()
+    #Draws the pre-binned counts from the fused aggregation pass
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge')
+    ax.set_title("Histogram of Elevation")
+    ax.set_xlabel("Elevation (ft)")
+    ax.set_ylabel("Count")
+    return fig
+
+#Columnar-to-records conversion done once per filter signature; pydeck
+#otherwise re-serializes the DataFrame row by row on every Deck build
+@st.cache_data(show_spinner=False)
+def build_map_records(map_data, heat_data):
+    return map_data.to_dict('records'), heat_data.to_dict('records')
+
+@st.cache_resource(show_spinner=False)
+def make_airport_deck(map_records, heat_records, view_lat, view_lon):
+    #Hover Icon for Map, additional cool feature for heatmap [ST4]
+    tooltip = {
+        "html": "<b>Name:</b> {name} <br/>"
+                "<b>Type:</b> {type} <br/>"
+                "<b>Elevation (ft):</b> {elevation_ft}",
+        "style": {
+            "backgroundColor": "steelblue",
+            "color": "white"
+        }
+    }
+
+    scatter_layer = pdk.Layer(
+        "ScatterplotLayer",
+        data=map_records,
+        get_position="[longitude_deg, latitude_deg]",
+        get_radius=5000,
+        get_fill_color="[200, 30, 0, 160]",
+        pickable=True,
+    )
+
+    heatmap_layer = pdk.Layer(
+        "HeatmapLayer",
+        data=heat_records,
+        get_position="[longitude_deg, latitude_deg]",
+        get_weight="weight",
+        aggregation="sum",
+        threshold=1,
+        intensity=1
+    )
+
+    return pdk.Deck(
+        map_style="mapbox://styles/mapbox/light-v9",
+        initial_view_state=pdk.ViewState(
+            latitude=view_lat,
+            longitude=view_lon,
+            zoom=7,
+            pitch=50,
+        ),
+        layers=[scatter_layer, heatmap_layer],
+        tooltip=tooltip
+    )
 
 #Data Analysis Function [PY2] [DA9]
+@st.cache_data(show_spinner=False)
 def analyze_airport_data(df):
     try: #[PY3]
         total_airports = len(df)
         avg_elevation = df['elevation_ft'].mean()
-        airport_counts = df['type'].value_counts().to_dict() #[PY5]
+        airport_counts = category_counts(df['type']).to_dict() #[PY5]
         return total_airports, avg_elevation, airport_counts
     except Exception as e:
         st.error(f"Error during analysis: {e}")
@@ -70,47 +294,43 @@ def run_airport_explorer(df):
     st.title("New England Airports Data Explorer")
 
     #Sidebar Filter (remove and add, select back) [ST1]
-    st.sidebar.title("Filters")
-    selected_state = st.sidebar.multiselect("Select State(s)", options=df['iso_region'].unique(),
-                                            default=df['iso_region'].unique())
-    selected_type = st.sidebar.multiselect("Select Airport Type(s)", options=df['type'].unique(),
-                                           default=df['type'].unique())
-    selected_elevation = st.sidebar.multiselect("Select Elevation Category", options=df['elevation_category'].unique(),
-                                                default=df['elevation_category'].unique())
-
-    #Numeric Filters [ST2]
-    st.sidebar.title("Numeric Filters")
-    min_elevation = int(df['elevation_ft'].min())
-    max_elevation = int(df['elevation_ft'].max())
-    elevation_range = st.sidebar.slider(
-        "Elevation Range (ft)",
-        min_value=min_elevation,
-        max_value=max_elevation,
-        value=(min_elevation, max_elevation)
-    )
+    #Batched in a form so tweaking several widgets causes one rerun on
+    #Apply instead of a full rerun per click
+    meta = get_dataset_meta(df)
 
-    if 'runway_length_ft' in df.columns:
-        min_runway = int(df['runway_length_ft'].min())
-        max_runway = int(df['runway_length_ft'].max())
-        runway_range = st.sidebar.slider(
-            "Runway Length Range (ft)",
-            min_value=min_runway,
-            max_value=max_runway,
-            value=(min_runway, max_runway)
+    st.sidebar.title("Filters")
+    with st.sidebar.form("filters"):
+        selected_state = st.multiselect("Select State(s)", options=meta['states'],
+                                        default=meta['states'])
+        selected_type = st.multiselect("Select Airport Type(s)", options=meta['types'],
+                                       default=meta['types'])
+        selected_elevation = st.multiselect("Select Elevation Category", options=meta['elev_categories'],
+                                            default=meta['elev_categories'])
+
+        #Numeric Filters [ST2]
+        st.markdown("### Numeric Filters")
+        elevation_range = st.slider(
+            "Elevation Range (ft)",
+            min_value=meta['elev_min'],
+            max_value=meta['elev_max'],
+            value=(meta['elev_min'], meta['elev_max'])
         )
-    else:
-        runway_range = None
 
-    #Filtering Data on sidebar condition
-    filtered_data = df[
-        (df['iso_region'].isin(selected_state)) & #[DA5]
-        (df['type'].isin(selected_type)) &
-        (df['elevation_category'].isin(selected_elevation)) &
-        (df['elevation_ft'].between(*elevation_range)) #[DA4]
-        ]
+        if 'runway_min' in meta:
+            runway_range = st.slider(
+                "Runway Length Range (ft)",
+                min_value=meta['runway_min'],
+                max_value=meta['runway_max'],
+                value=(meta['runway_min'], meta['runway_max'])
+            )
+        else:
+            runway_range = None
+
+        st.form_submit_button("Apply Filters")
 
-    if runway_range is not None:
-        filtered_data = filtered_data[filtered_data['runway_length_ft'].between(*runway_range)]
+    #Filtering Data on sidebar condition (cached on the filter signature)
+    filtered_data = filter_airports(df, tuple(selected_state), tuple(selected_type),
+                                    tuple(selected_elevation), elevation_range, runway_range)
 
     #Data Explo.
     st.subheader("Filtered Airport Data")
@@ -120,27 +340,29 @@ def run_airport_explorer(df):
     st.subheader("Visualizations")
 
     #Bar Chart (Visualization) [VIZ1]
+    type_counts, pivot_table, elev_hist, elev_bin_edges = summarize_airports(filtered_data)
     st.markdown("### Airport Type Distribution")
-    st.bar_chart(filtered_data['type'].value_counts())
+    st.bar_chart(type_counts)
 
-    #Elevation Categories, Pie chart [PY4] [ST3] [VIZ2]
+    #Elevation Categories, Pie chart [ST3] [VIZ2]
+    #One multiselect instead of a checkbox widget per category, so picking
+    #several categories is one widget (and one rerun) rather than N
     st.sidebar.title("Pie Chart Categories")
-    selected_categories = [
-        category for category in filtered_data['elevation_category'].unique()
-        if st.sidebar.checkbox(f"Show {category} Elevation", value=True)
-    ]
+    selected_categories = st.sidebar.multiselect("Pie Categories",
+                                                 options=meta['elev_categories'],
+                                                 default=meta['elev_categories'])
 
     #Pie Chart (Visualization)
     if selected_categories:
         st.markdown("### Elevation Category Proportion")
-        filtered_for_pie = filtered_data[filtered_data['elevation_category'].isin(selected_categories)]
-        if not filtered_for_pie.empty:
-            fig, ax = plt.subplots()
-            filtered_for_pie['elevation_category'].value_counts().plot.pie(
-                autopct='%1.1f%%', startangle=140, ax=ax
-            )
-            ax.set_ylabel('')
-            st.pyplot(fig)
+        #Slice just the category column instead of copying the whole frame
+        elev_cats = filtered_data['elevation_category']
+        pie_cats = elev_cats[category_isin(elev_cats, selected_categories)]
+        if not pie_cats.empty:
+            #Deselected/absent categories count 0; keep them off the pie
+            #so it doesn't draw overlapping 0.0% slices
+            pie_counts = category_counts(pie_cats)
+            st.pyplot(make_pie_figure(pie_counts[pie_counts > 0]))
         else:
             st.warning("No data available for the selected elevation categories.")
     else:
@@ -149,67 +371,36 @@ def run_airport_explorer(df):
     #Map (Visualization) [MAP]
     st.subheader("Airport Locations Map")
 
-    #Valid Cords. check
-    if not filtered_data.empty and 'latitude_deg' in filtered_data.columns and 'longitude_deg' in filtered_data.columns:
-        filtered_data = filtered_data.dropna(subset=['latitude_deg', 'longitude_deg'])
-
-        #Error Checking, w/ no Valid Locations
-        if filtered_data.empty:
-            st.warning("No valid location data available to plot.")
-        else: #Hover Icon for Map, additional cool feature for heatmap [ST4]
-            tooltip = {
-                "html": "<b>Name:</b> {name} <br/>"
-                        "<b>Type:</b> {type} <br/>"
-                        "<b>Elevation (ft):</b> {elevation_ft}",
-                "style": {
-                    "backgroundColor": "steelblue",
-                    "color": "white"
-                }
-            }
-
-            scatter_layer = pdk.Layer(
-                "ScatterplotLayer",
-                data=filtered_data,
-                get_position="[longitude_deg, latitude_deg]",
-                get_radius=5000,
-                get_fill_color="[200, 30, 0, 160]",
-                pickable=True,
-            )
-
-            heatmap_layer = pdk.Layer(
-                "HeatmapLayer",
-                data=filtered_data,
-                get_position="[longitude_deg, latitude_deg]",
-                aggregation="sum",
-                threshold=1,
-                intensity=1
-            )
-
-            st.pydeck_chart(pdk.Deck(
-                map_style="mapbox://styles/mapbox/light-v9",
-                initial_view_state=pdk.ViewState(
-                    latitude=filtered_data['latitude_deg'].mean(),
-                    longitude=filtered_data['longitude_deg'].mean(),
-                    zoom=7,
-                    pitch=50,
-                ),
-                layers=[scatter_layer, heatmap_layer],
-                tooltip=tooltip
-            ))
-    else:
+    #Coordinates were cleaned at load time, so only emptiness can stop us
+    if filtered_data.empty:
         st.warning("No location data to display on the map.")
+    else:
+        #Only ship the columns the layers/tooltip actually use to the
+        #browser instead of serializing the whole DataFrame
+        map_data = filtered_data[['longitude_deg', 'latitude_deg', 'name',
+                                  'type', 'elevation_ft']]
+
+        #Pre-bin the heatmap into ~0.01 degree cells with counts as
+        #weights, so it gets aggregated cells rather than every row
+        lat_bin = (filtered_data['latitude_deg'] * 100).astype('int32').rename('lat_bin')
+        lon_bin = (filtered_data['longitude_deg'] * 100).astype('int32').rename('lon_bin')
+        heat_data = filtered_data.groupby([lat_bin, lon_bin]).size().reset_index(name='weight')
+        heat_data['latitude_deg'] = heat_data['lat_bin'] / 100.0
+        heat_data['longitude_deg'] = heat_data['lon_bin'] / 100.0
+
+        map_records, heat_records = build_map_records(
+            map_data, heat_data[['longitude_deg', 'latitude_deg', 'weight']])
+        st.pydeck_chart(make_airport_deck(
+            map_records, heat_records,
+            float(map_data['latitude_deg'].mean()),
+            float(map_data['longitude_deg'].mean())))
 
     #Numeric Charts Section Subheader
     st.subheader("Numeric Filtering Visualizations")
 
     #Elevation Histogram
     st.markdown("### Elevation Distribution")
-    fig, ax = plt.subplots()
-    filtered_data['elevation_ft'].hist(bins=20, ax=ax)
-    ax.set_title("Histogram of Elevation")
-    ax.set_xlabel("Elevation (ft)")
-    ax.set_ylabel("Count")
-    st.pyplot(fig)
+    st.pyplot(make_histogram_figure(elev_hist, elev_bin_edges))
 
     #Summary Stats.
     st.subheader("Summary Statistics")
@@ -221,8 +412,6 @@ def run_airport_explorer(df):
 
     #Pivot Table [DA6]
     st.subheader("Pivot Table: Airports by Type and State")
-    pivot_table = filtered_data.pivot_table(index='iso_region', columns='type', values='id', aggfunc='count',
-                                            fill_value=0)
     st.dataframe(pivot_table)
 
 #misc.